@@ -0,0 +1,201 @@
+from collections import defaultdict
+
+# Repository data "type" of Google Docs, whose "stats" are the {email: {date: words added}} output of
+# compute_word_contributions in cwcid_google_doc_analysis rather than git statistics
+GOOGLE_DOC_TYPE = "GoogleDoc"
+
+
+def normalize_identity(identity):
+    """Normalize an author name or email so that trivial variations compare equal."""
+    if not identity:
+        return "unknown"
+    return " ".join(str(identity).split()).lower()
+
+
+def _find(parents, key):
+    """
+    Return the representative of key in the union-find forest, compressing the path.
+    """
+    parents.setdefault(key, key)
+    root = key
+    while parents[root] != root:
+        root = parents[root]
+    while parents[key] != root:
+        parents[key], key = root, parents[key]
+    return root
+
+
+def _union(parents, key_a, key_b, preferred=()):
+    """
+    Merge the sets containing key_a and key_b, keeping a preferred (canonical) root if there is one.
+    """
+    root_a = _find(parents, key_a)
+    root_b = _find(parents, key_b)
+    if root_a == root_b:
+        return
+    if root_b in preferred and root_a not in preferred:
+        root_a, root_b = root_b, root_a
+    parents[root_b] = root_a
+
+
+def build_author_index(repo_dict_data, author_alias_dict=None):
+    """
+    Build a single author/identity index for all repositories and documents of a run.
+
+    Aliases are merged with mailmap-style rules from author_alias_dict, which maps a canonical
+    name to a list of other names and emails used by the same person, and by linking the
+    name of every git author to each email recorded for that author. Each identity is then
+    mapped to its repositories, documents and notification recipients so that routing and
+    per-person summaries are dictionary lookups rather than rescans of every repository.
+
+    Entries of type GOOGLE_DOC_TYPE are indexed as documents with the absolute words changed and
+    the number of days with changes; all other entries are indexed as git repositories.
+
+    The returned index has the form:
+        {"aliases": {normalized name or email: canonical name},
+         "authors": {canonical name: {"names", "emails", "repos", "documents", "recipients",
+                                      "line_changes", "commits", "word_changes"}},
+         "recipients": {email: {"repos", "CC", "Reply-to", "attachments"}}}
+    where all collections are insertion-ordered dicts used as sets.
+    """
+    if author_alias_dict is None:
+        author_alias_dict = {}
+
+    parents = {}
+    display_names = {}
+    # Mailmap-style rules: every alias resolves to its canonical name
+    for canonical, aliases in author_alias_dict.items():
+        canonical_key = normalize_identity(canonical)
+        display_names[canonical_key] = canonical
+        for alias in aliases:
+            _union(parents, canonical_key, normalize_identity(alias), display_names)
+    canonical_keys = set(display_names)
+
+    # Link each git author name to all of its emails (Google Doc stats are already keyed by email)
+    for repo_dict in repo_dict_data:
+        if repo_dict.get("type") == GOOGLE_DOC_TYPE:
+            for author in repo_dict.get("stats", {}):
+                display_names.setdefault(normalize_identity(author), author)
+                _find(parents, normalize_identity(author))
+            continue
+        for author, data in repo_dict.get("stats", {}).items():
+            author_key = normalize_identity(author)
+            display_names.setdefault(author_key, author)
+            _find(parents, author_key)
+            for email in data.get("emails", {}):
+                _union(parents, author_key, normalize_identity(email), canonical_keys)
+
+    # Notification recipients are identified by email and resolve through the same aliases
+    for repo_dict in repo_dict_data:
+        for notify_email in repo_dict.get("notify", {}).get("TO", []):
+            display_names.setdefault(normalize_identity(notify_email), notify_email)
+
+    authors = {}
+    aliases = {}
+
+    def resolve(identity):
+        key = normalize_identity(identity)
+        if key in aliases:
+            return aliases[key]
+        canonical = display_names.get(_find(parents, key), identity)
+        aliases[key] = canonical
+        return canonical
+
+    def author_entry(canonical):
+        if canonical not in authors:
+            authors[canonical] = {"names": {}, "emails": {}, "repos": {}, "documents": {},
+                                  "recipients": {}, "line_changes": 0, "commits": 0, "word_changes": 0}
+        return authors[canonical]
+
+    recipients = defaultdict(lambda: {"repos": {}, "CC": {}, "Reply-to": {}, "attachments": {}})
+    for repo_dict in repo_dict_data:
+        repo_name = repo_dict["name"]
+        repo_notify = repo_dict.get("notify", {})
+
+        if repo_dict.get("type") == GOOGLE_DOC_TYPE:
+            for author, daily_words in repo_dict.get("stats", {}).items():
+                entry = author_entry(resolve(author))
+                entry["names"][author] = None
+                if "@" in author:
+                    entry["emails"][author] = None
+                word_changes = sum(abs(words) for words in daily_words.values())
+                doc_totals = entry["documents"].setdefault(repo_name, {"word_changes": 0, "active_days": 0})
+                doc_totals["word_changes"] += word_changes
+                doc_totals["active_days"] += len(daily_words)
+                entry["word_changes"] += word_changes
+        else:
+            for author, data in repo_dict.get("stats", {}).items():
+                canonical = resolve(author)
+                entry = author_entry(canonical)
+                entry["names"][author] = None
+                for email in data.get("emails", {}):
+                    entry["emails"][email] = None
+                    aliases.setdefault(normalize_identity(email), canonical)
+                if "@" in author:
+                    entry["emails"][author] = None
+                repo_totals = entry["repos"].setdefault(repo_name, {"line_changes": 0, "commits": 0})
+                # Statistics from stream_statistics count commits instead of listing them
+                commit_count = data.get("commit_count", len(data.get("commits", [])))
+                repo_totals["line_changes"] += data.get("line_changes", 0)
+                repo_totals["commits"] += commit_count
+                entry["line_changes"] += data.get("line_changes", 0)
+                entry["commits"] += commit_count
+
+        for notify_email in repo_notify.get("TO", []):
+            recipient = recipients[notify_email]
+            recipient["repos"][repo_name] = None
+            recipient["CC"].update(dict.fromkeys(repo_notify.get("CC", [])))
+            recipient["Reply-to"].update(dict.fromkeys(repo_notify.get("Reply-to", [])))
+            recipient["attachments"].update(dict.fromkeys(repo_dict.get("activity_plot", [])))
+            entry = author_entry(resolve(notify_email))
+            entry["emails"][notify_email] = None
+            entry["recipients"][notify_email] = None
+
+    # Resolve the remaining aliases so that lookups by any known name or email are O(1)
+    for key in list(parents):
+        resolve(key)
+
+    return {"aliases": aliases, "authors": authors, "recipients": dict(recipients)}
+
+
+def lookup_author(author_index, identity):
+    """
+    Return the canonical author name for a name or email, or None if it is not indexed.
+    """
+    return author_index["aliases"].get(normalize_identity(identity))
+
+
+def summarize_author(author_index, identity):
+    """
+    Summarize the contributions of one person across all repositories and documents.
+    """
+    canonical = lookup_author(author_index, identity)
+    if canonical is None:
+        return None
+    entry = author_index["authors"][canonical]
+    return {
+        "author": canonical,
+        "names": list(entry["names"]),
+        "emails": list(entry["emails"]),
+        "line_changes": entry["line_changes"],
+        "commits": entry["commits"],
+        "word_changes": entry["word_changes"],
+        "repos": dict(entry["repos"]),
+        "documents": dict(entry["documents"]),
+    }
+
+
+def format_author_summary(summary):
+    """
+    Format a per-person cross-project summary as a string for the email body.
+    """
+    lines = [f"Author: {summary['author']}",
+             f"  Total Line Changes: {summary['line_changes']}",
+             f"  Total Commits: {summary['commits']}"]
+    for repo_name, totals in summary["repos"].items():
+        lines.append(f"    - {repo_name}: {totals['line_changes']} line changes in {totals['commits']} commits")
+    if summary["documents"]:
+        lines.append(f"  Total Word Changes: {summary['word_changes']}")
+    for doc_name, totals in summary["documents"].items():
+        lines.append(f"    - {doc_name}: {totals['word_changes']} word changes on {totals['active_days']} days")
+    return "\n".join(lines) + "\n"
@@ -1,10 +1,17 @@
 # Add repositories with URLs and emails for where to send the report
+# Optional "include"/"exclude" lists of path patterns limit which files count towards line statistics.
+# Overleaf repositories always exclude LaTeX build artifacts (*.aux, *.bbl, ...) and output.pdf;
+# "exclude" patterns are added to these defaults
+# Google Docs are tracked with "type": "GoogleDoc" and a "document_id" instead of "auth" and "url", e.g.
+#   {"type": "GoogleDoc", "name": "Proposal Draft", "document_id": "1h4dQH9U9wgkN7xnqThw4GAsKyoEeGUHm9BcGEFgRkaA",
+#    "notify": {"TO": ["studentA@university.edu"], "CC": [], "Reply-to": []}}
 repo_dict_data = [
     {
         "type": "Overleaf",
         "auth": "Overleaf",
         "name": "Article Project A",
         "url": "https://git.overleaf.com/aaaaaaaaaaaaaaaaaaaaaaaaa",
+        "exclude": ["old_drafts/*", "*.bak"],
         "notify": {
             "TO": ["studentA@university.edu"],
             "CC": ["facultyB@university.edu"],
@@ -42,3 +49,8 @@ repo_dict_data = [
         },
     }
 ]
+# Map each author's canonical name to the other names and emails they commit or edit under (like a git .mailmap)
+author_alias_dict = {
+    "Student A": ["studentA@university.edu", "studenta", "Student A (Overleaf)"],
+    "Faculty B": ["facultyB@university.edu"]
+}
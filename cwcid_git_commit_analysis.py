@@ -1,21 +1,21 @@
 import argparse
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from cwcid_author_index import GOOGLE_DOC_TYPE
 import git
-import matplotlib
-matplotlib.use('TkAgg', force=True)
-# matplotlib.use('Agg', force=True)
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
+import html
+import math
 import os
 from pathlib import Path
 import random
 import smtplib
 import string
+import tempfile
 
 
 def generate_random_filename(length=10):
@@ -56,33 +56,268 @@ def clone_or_pull_repo(repo_url, repo_auth, local_path, username, token):
         return None
 
 
-def gather_statistics(repo):  # , start_date, end_date):
+# File extensions used to break line statistics down by file type
+FILE_TYPE_EXTENSIONS = {
+    "tex": [".tex", ".sty", ".cls", ".bst"],
+    "bib": [".bib"],
+    "code": [".py", ".m", ".c", ".h", ".cpp", ".hpp", ".java", ".js", ".ts", ".sh", ".r", ".jl", ".ipynb"],
+    "figures": [".png", ".jpg", ".jpeg", ".gif", ".pdf", ".eps", ".ps", ".svg", ".tif", ".tiff", ".bmp"],
+}
+EXTENSION_FILE_TYPES = {ext: file_type for file_type, exts in FILE_TYPE_EXTENSIONS.items() for ext in exts}
+
+# LaTeX build artifacts and the regenerated PDF that Overleaf repositories commit but that are not
+# authored content; per-repository "exclude" patterns are added to these
+DEFAULT_OVERLEAF_EXCLUDE = ["*.aux", "*.bbl", "*.blg", "*.log", "*.out", "*.toc", "*.lof", "*.lot",
+                            "*.fls", "*.fdb_latexmk", "*.synctex.gz", "output.pdf"]
+
+# Each commit of the single-pass "git log --numstat" used by gather_statistics is written as
+# NUL, author name, author email, commit time and message separated by US, NUL, numstat lines
+_NUMSTAT_LOG_FORMAT = "%x00%an%x1f%ae%x1f%ct%x1f%B%x00"
+
+# Tableau colors (matplotlib's TABLEAU_COLORS) used for the authors in all charts for better contrast
+AUTHOR_COLOR_PALETTE = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+                        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
+
+# Block characters of the Unicode sparklines in the HTML and text reports, from lowest to highest
+SPARKLINE_LEVELS = "\u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
+
+# "git log --diff-merges=first-parent", used for the numstat log, needs git 2.31 or newer
+MIN_GIT_VERSION = (2, 31)
+
+# Smallest number of commits worth handing to a backfill worker process, and the largest so that
+# partitions stay small enough to balance the load and to hold in memory
+MIN_BACKFILL_PARTITION_SIZE = 25
+MAX_BACKFILL_PARTITION_SIZE = 5000
+
+
+def classify_file_type(path):
+    """Return the file type category ("tex", "bib", "code", "figures" or "other") of a path."""
+    return EXTENSION_FILE_TYPES.get(os.path.splitext(path)[1].lower(), "other")
+
+
+def build_pathspecs(include=None, exclude=None):
+    """
+    Convert include/exclude path patterns into git pathspecs.
+    """
+    pathspecs = list(include or [])
+    pathspecs += [f":(exclude){pattern}" for pattern in exclude or []]
+    return pathspecs
+
+
+def gather_statistics(repo, include=None, exclude=None):  # , start_date, end_date):
     """
     Compute statistics aggregated by username.
+
+    Line statistics for all commits come from a single "git log --numstat" pass limited to the
+    include/exclude path patterns, so excluded files are never diffed. Binary files (reported by
+    git as "-" in numstat) count as changed files but not as changed lines, and the changes of
+    each author are also broken down by file type (see FILE_TYPE_EXTENSIONS). Commits that only
+    touch excluded files are not counted.
     """
-    statistics = {}
+    # Match GitPython's commit.stats: no rename detection, merges diffed against their first parent,
+    # and full history so that path limiting does not prune merged branches
+    log_output = repo.git.log(f"--format={_NUMSTAT_LOG_FORMAT}", "--numstat", "--no-renames", "--full-history",
+                              "--diff-merges=first-parent", "--", *build_pathspecs(include, exclude))
+    return aggregate_numstat_log(log_output)
+
+
+def _parse_numstat_record(header, numstat):
+    """
+    Parse one commit of the numstat log into (author, email, commit date, message, insertions,
+    deletions, file changes), where file changes are (file type, insertions, deletions, is binary).
+    """
+    author, email, committed_date, message = header.split("\x1f", 3)
+    insertions = 0
+    deletions = 0
+    file_changes = []
+    for line in numstat.splitlines():
+        if not line:
+            continue
+        added, removed, path = line.split("\t", 2)
+        path = path.strip('"')  # Paths with special characters are quoted by git
+        is_binary = added == "-"
+        added = 0 if is_binary else int(added)
+        removed = 0 if is_binary else int(removed)
+        insertions += added
+        deletions += removed
+        file_changes.append((classify_file_type(path), added, removed, is_binary))
+    return (author or "Unknown", email or None, datetime.fromtimestamp(int(committed_date)), message,
+            insertions, deletions, file_changes)
+
+
+def _add_file_type_changes(author_stats, file_changes):
+    """Add the file changes of one commit to the per-file-type breakdown of an author."""
+    for file_type, added, removed, is_binary in file_changes:
+        if file_type not in author_stats["file_types"]:
+            author_stats["file_types"][file_type] = {"insertions": 0, "deletions": 0, "files": 0, "binary_files": 0}
+        type_stats = author_stats["file_types"][file_type]
+        type_stats["insertions"] += added
+        type_stats["deletions"] += removed
+        type_stats["files"] += 1
+        type_stats["binary_files"] += is_binary
+
+
+def aggregate_numstat_log(log_output, statistics=None):
+    """
+    Fold the output of "git log --format=_NUMSTAT_LOG_FORMAT --numstat" into per-author statistics.
+    """
+    if statistics is None:
+        statistics = {}
     # Iterate through all commits
-    for commit in repo.iter_commits():
-        commit_date = datetime.fromtimestamp(commit.committed_date)
-        author = commit.author.name if commit.author else "Unknown"
-        stats = commit.stats.total
+    records = log_output.split("\x00")
+    for header, numstat in zip(records[1::2], records[2::2]):
+        author, email, commit_date, message, insertions, deletions, file_changes = \
+            _parse_numstat_record(header, numstat)
         # Update statistics
         if author not in statistics:
-            statistics[author] = {"line_changes": 0, "commits": []}
-        statistics[author]["line_changes"] += stats["insertions"] + stats["deletions"]
+            statistics[author] = {"line_changes": 0, "commits": [], "emails": {}, "file_types": {}}
+        if email:
+            statistics[author]["emails"][email] = None
+        statistics[author]["line_changes"] += insertions + deletions
         statistics[author]["commits"].append({
             "date": commit_date.strftime("%Y-%m-%d %H:%M:%S"),
-            "message": commit.message.strip(),
-            "insertions": stats["insertions"],
-            "deletions": stats["deletions"],
+            "message": message.strip(),
+            "insertions": insertions,
+            "deletions": deletions,
         })
+        _add_file_type_changes(statistics[author], file_changes)
 
     return statistics
 
 
-def send_email(subject, body, notify, email_auth_dict, attachments):
+def _iter_numstat_records(stream, chunk_size=1 << 16):
+    """
+    Yield the (header, numstat) records of a numstat log read incrementally from a binary stream.
+    """
+    buffer = b""
+    fields = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        parts = (buffer + chunk).split(b"\x00")
+        buffer = parts.pop()
+        fields.extend(part.decode("utf-8", errors="replace") for part in parts)
+        # The first field is the empty text before the first record
+        while len(fields) >= 3:
+            yield fields[1], fields[2]
+            del fields[1:3]
+    fields.append(buffer.decode("utf-8", errors="replace"))
+    if len(fields) >= 3:
+        yield fields[1], fields[2]
+
+
+def stream_statistics(repo, include=None, exclude=None):
+    """
+    Compute per-author statistics in bounded memory by streaming the numstat log.
+
+    Commits are folded straight into per-author and per-day counters instead of being kept in
+    per-author commit lists, so memory grows with the number of authors and active days but not
+    with the number of commits. Each author has the same "line_changes", "emails" and "file_types"
+    as with gather_statistics, plus "commit_count" and "daily", which maps each commit date to its
+    "commits", "insertions" and "deletions".
+    """
+    statistics = {}
+    process = repo.git.log(f"--format={_NUMSTAT_LOG_FORMAT}", "--numstat", "--no-renames", "--full-history",
+                           "--diff-merges=first-parent", "--", *build_pathspecs(include, exclude),
+                           as_process=True)
+    for header, numstat in _iter_numstat_records(process.stdout):
+        author, email, commit_date, _, insertions, deletions, file_changes = _parse_numstat_record(header, numstat)
+        if author not in statistics:
+            statistics[author] = {"line_changes": 0, "commit_count": 0, "emails": {}, "file_types": {},
+                                  "daily": {}}
+        author_stats = statistics[author]
+        if email:
+            author_stats["emails"][email] = None
+        author_stats["line_changes"] += insertions + deletions
+        author_stats["commit_count"] += 1
+        day = commit_date.date()
+        if day not in author_stats["daily"]:
+            author_stats["daily"][day] = {"commits": 0, "insertions": 0, "deletions": 0}
+        author_stats["daily"][day]["commits"] += 1
+        author_stats["daily"][day]["insertions"] += insertions
+        author_stats["daily"][day]["deletions"] += deletions
+        _add_file_type_changes(author_stats, file_changes)
+    process.wait()
+    return statistics
+
+
+def merge_statistics(partial_statistics):
+    """
+    Merge per-author statistics computed for consecutive partitions of the commit history.
+
+    Partitions must be given in history order so that the commit lists (and the order in which
+    authors first appear) are the same as for a single serial walk.
+    """
+    statistics = {}
+    for partial in partial_statistics:
+        for author, data in partial.items():
+            if author not in statistics:
+                statistics[author] = {"line_changes": 0, "commits": [], "emails": {}, "file_types": {}}
+            statistics[author]["emails"].update(data["emails"])
+            statistics[author]["line_changes"] += data["line_changes"]
+            statistics[author]["commits"].extend(data["commits"])
+            for file_type, type_data in data["file_types"].items():
+                if file_type not in statistics[author]["file_types"]:
+                    statistics[author]["file_types"][file_type] = dict(type_data)
+                    continue
+                type_stats = statistics[author]["file_types"][file_type]
+                for key, value in type_data.items():
+                    type_stats[key] += value
+    return statistics
+
+
+def _gather_partition_statistics(repo_path, commit_hashes, pathspecs):
+    """
+    Compute the statistics of one history partition; runs in a worker process.
+    """
+    repo = git.Repo(repo_path)
+    # The hashes are passed on stdin since a partition can exceed the command line length limit
+    with tempfile.TemporaryFile() as hash_file:
+        hash_file.write("\n".join(commit_hashes).encode("ascii") + b"\n")
+        hash_file.seek(0)
+        # --no-walk=unsorted keeps the commits in the order of the serial walk
+        log_output = repo.git.log(f"--format={_NUMSTAT_LOG_FORMAT}", "--numstat", "--no-renames",
+                                  "--diff-merges=first-parent", "--no-walk=unsorted", "--stdin",
+                                  "--", *pathspecs, istream=hash_file)
+    return aggregate_numstat_log(log_output)
+
+
+def backfill_statistics(repo, include=None, exclude=None, workers=None, partitions_per_worker=4):
+    """
+    Compute the same statistics as gather_statistics, processing the history in parallel.
+
+    The commits selected by the serial walk are split into about partitions_per_worker revision
+    partitions per worker (all cores by default), of MIN_BACKFILL_PARTITION_SIZE to
+    MAX_BACKFILL_PARTITION_SIZE commits. The numstat of each partition is computed in a separate
+    worker process and the per-author partial statistics are merged in history order, so the
+    result is exactly that of gather_statistics. Falls back to gather_statistics if a worker
+    fails. Intended for the first run on repositories with a long history.
+    """
+    workers = workers or os.cpu_count() or 1
+    pathspecs = build_pathspecs(include, exclude)
+    commit_hashes = repo.git.rev_list("--full-history", "HEAD", "--", *pathspecs).split()
+    partition_size = math.ceil(len(commit_hashes) / (workers * partitions_per_worker))
+    partition_size = min(max(partition_size, MIN_BACKFILL_PARTITION_SIZE), MAX_BACKFILL_PARTITION_SIZE)
+    if workers == 1 or len(commit_hashes) <= partition_size:
+        return gather_statistics(repo, include, exclude)
+
+    partitions = [commit_hashes[i:i + partition_size] for i in range(0, len(commit_hashes), partition_size)]
+    print(f"Backfilling {len(commit_hashes)} commits of {repo.working_dir} in {len(partitions)} partitions...")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partial_statistics = executor.map(_gather_partition_statistics, [repo.working_dir] * len(partitions),
+                                              partitions, [pathspecs] * len(partitions))
+            return merge_statistics(partial_statistics)
+    except Exception as e:
+        print(f"Error in parallel backfill: {e}. Computing statistics serially...")
+        return gather_statistics(repo, include, exclude)
+
+
+def send_email(subject, body, notify, email_auth_dict, attachments, html_body=None):
     """
     Send an email with the given subject and body to the specified recipients.
+    If html_body is given it is sent with the plain-text body as its alternative.
     """
     smtp_server = email_auth_dict["smtp_server"]
     smtp_port = email_auth_dict["smtp_port"]
@@ -98,7 +333,13 @@ def send_email(subject, body, notify, email_auth_dict, attachments):
         msg["Reply-to"] = ", ".join(notify["Reply-to"])
     msg["Subject"] = subject
 
-    msg.attach(MIMEText(body))
+    if html_body is None:
+        msg.attach(MIMEText(body))
+    else:
+        alternative = MIMEMultipart("alternative")
+        alternative.attach(MIMEText(body))
+        alternative.attach(MIMEText(html_body, "html"))
+        msg.attach(alternative)
 
     for path in attachments:
         part = MIMEBase('application', "octet-stream")
@@ -122,45 +363,72 @@ def send_email(subject, body, notify, email_auth_dict, attachments):
         print(f"Error sending email: {e}")
 
 
+def iter_format_statistics(statistics):
+    """
+    Yield the formatted report of the aggregated statistics line by line.
+
+    Statistics from stream_statistics are reported per day rather than per commit.
+    """
+    for author, data in statistics.items():
+        yield f"Author: {author}\n"
+        yield f"  Total Line Changes: {data['line_changes']}\n"
+        if "daily" in data:
+            yield f"  Total Commits: {data['commit_count']}\n"
+            yield "  Daily Changes:\n"
+            for day in sorted(data["daily"]):
+                counters = data["daily"][day]
+                yield (f"    - Date: {day}, Commits: {counters['commits']}, "
+                       f"Insertions: {counters['insertions']}, Deletions: {counters['deletions']}\n")
+        else:
+            yield f"  Commits:\n"
+            for commit in data["commits"]:
+                yield f"    - Commit Date: {commit['date']}, Message: {commit['message']}\n"
+                yield f"      Insertions: {commit['insertions']}, Deletions: {commit['deletions']}\n"
+        yield "\n"
+
+
+def write_statistics(statistics, file):
+    """
+    Write the formatted report of the aggregated statistics to a text file object.
+    """
+    file.writelines(iter_format_statistics(statistics))
+
+
 def format_statistics(statistics):
     """
     Format the aggregated statistics as a string for the email body.
     """
-    # email_body = f"{header}:\n"
-    email_body = ""
-    for author, data in statistics.items():
-        email_body += f"Author: {author}\n"
-        email_body += f"  Total Line Changes: {data['line_changes']}\n"
-        email_body += f"  Commits:\n"
-        for commit in data["commits"]:
-            email_body += f"    - Commit Date: {commit['date']}, Message: {commit['message']}\n"
-            email_body += f"      Insertions: {commit['insertions']}, Deletions: {commit['deletions']}\n"
-        email_body += "\n"
-    return email_body
+    return "".join(iter_format_statistics(statistics))
 
 
-def plot_change_history(repo_data, image_folder="./images"):
-    stats = repo_data["stats"]
+def aggregate_daily_changes(stats):
+    """
+    Aggregate contributions per day per author for the activity charts.
+
+    Returns the sorted dates, the sorted authors, and per-author lists with the insertions and
+    the (negated) deletions on each date.
+    """
     # Aggregate contributions per day per author (separate insertions & deletions)
     daily_insertions = defaultdict(lambda: defaultdict(int))
     daily_deletions = defaultdict(lambda: defaultdict(int))
 
     for author, data in stats.items():
+        if "daily" in data:
+            # Statistics from stream_statistics are already aggregated per day
+            for commit_date, counters in data["daily"].items():
+                daily_insertions[commit_date][author] += counters['insertions']
+                daily_deletions[commit_date][author] -= counters['deletions']
+            continue
         for commit in data['commits']:
             commit_date = datetime.strptime(commit['date'], '%Y-%m-%d %H:%M:%S').date()
             daily_insertions[commit_date][author] += commit['insertions']
             daily_deletions[commit_date][author] -= commit['deletions']
     # Sort dates in ascending order
     sorted_dates = sorted(set(daily_insertions.keys()).union(set(daily_deletions.keys())))
-    sorted_date_strs = [str(date) for date in sorted_dates]
 
     # Get unique authors
     authors = sorted(set(author for contributions in daily_insertions.values() for author in contributions))
 
-    # Assign colors dynamically
-    color_palette = list(mcolors.TABLEAU_COLORS.values())  # Use Tableau colors for better contrast
-    colors = {author: color_palette[i % len(color_palette)] for i, author in enumerate(authors)}
-
     # Prepare data for stacked bars
     insertions_data = {author: [] for author in authors}
     deletions_data = {author: [] for author in authors}
@@ -169,6 +437,28 @@ def plot_change_history(repo_data, image_folder="./images"):
         for author in authors:
             insertions_data[author].append(daily_insertions[date].get(author, 0))
             deletions_data[author].append(daily_deletions[date].get(author, 0))
+    return sorted_dates, authors, insertions_data, deletions_data
+
+
+def author_colors(authors):
+    """Assign a color to each author."""
+    color_palette = AUTHOR_COLOR_PALETTE
+    return {author: color_palette[i % len(color_palette)] for i, author in enumerate(authors)}
+
+
+def plot_change_history(repo_data, image_folder="./images"):
+    # matplotlib is only imported for the PNG report so that the HTML report does not pay for it
+    import matplotlib
+    matplotlib.use('TkAgg', force=True)
+    # matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as mcolors
+
+    sorted_dates, authors, insertions_data, deletions_data = aggregate_daily_changes(repo_data["stats"])
+    sorted_date_strs = [str(date) for date in sorted_dates]
+
+    # Assign colors dynamically
+    colors = author_colors(authors)
 
     # Plot stacked bar chart
     fig, ax = plt.subplots(figsize=(8, 5))
@@ -209,7 +499,114 @@ def plot_change_history(repo_data, image_folder="./images"):
     # plt.show()
 
 
-def track_git_changes(repo_dict_data, overleaf_auth_dict, folder="./git_repos/"):
+def render_sparkline(values):
+    """Render a list of non-negative values as a Unicode block sparkline."""
+    peak = max(values, default=0)
+    if peak <= 0:
+        return SPARKLINE_LEVELS[0] * len(values)
+    top = len(SPARKLINE_LEVELS) - 1
+    return "".join(SPARKLINE_LEVELS[math.ceil(value / peak * top)] for value in values)
+
+
+def format_file_type_changes(file_types):
+    """
+    Format the per-file-type changes of an author, as changed lines or, for types that are mostly
+    binary files (such as figures), as the number of changed files.
+    """
+    changes = []
+    for file_type, counts in sorted(file_types.items()):
+        if counts["binary_files"] * 2 > counts["files"]:
+            changes.append(f"{file_type}: {counts['files']} file{'s' if counts['files'] != 1 else ''}")
+        else:
+            changes.append(f"{file_type}: {counts['insertions'] + counts['deletions']}")
+    return ", ".join(changes)
+
+
+def summarize_repository(repo_data, max_days=30, end_date=None):
+    """
+    Summarize the statistics of one repository per author for the HTML and text reports.
+
+    Each author row has the commits, insertions, deletions, line changes, the changes by file type
+    and a sparkline of the daily line changes over the max_days calendar days up to end_date
+    (today by default), with zero for days without changes. Returns the first and last day of
+    that window and the author rows.
+    """
+    stats = repo_data["stats"]
+    if end_date is None:
+        end_date = datetime.now().date()
+    window = [end_date - timedelta(days=offset) for offset in range(max_days - 1, -1, -1)]
+    sorted_dates, _, insertions_data, deletions_data = aggregate_daily_changes(stats)
+    colors = author_colors(sorted(stats))
+    rows = []
+    for author, data in stats.items():
+        if "daily" in data:
+            commit_count = data["commit_count"]
+            insertions = sum(counters["insertions"] for counters in data["daily"].values())
+            deletions = sum(counters["deletions"] for counters in data["daily"].values())
+        else:
+            commit_count = len(data["commits"])
+            insertions = sum(commit["insertions"] for commit in data["commits"])
+            deletions = sum(commit["deletions"] for commit in data["commits"])
+        daily_changes = {}
+        if author in insertions_data:
+            # Deletions are negated by aggregate_daily_changes
+            daily_changes = {date: added - removed for date, added, removed
+                             in zip(sorted_dates, insertions_data[author], deletions_data[author])}
+        rows.append({
+            "author": author,
+            "color": colors[author],
+            "commits": commit_count,
+            "insertions": insertions,
+            "deletions": deletions,
+            "line_changes": data["line_changes"],
+            "file_types": format_file_type_changes(data.get("file_types", {})),
+            "sparkline": render_sparkline([daily_changes.get(date, 0) for date in window]),
+        })
+    return window[0], window[-1], rows
+
+
+def format_html_report(repo_data):
+    """
+    Format the statistics of one repository as an HTML section with a per-author table and inline
+    sparklines, as a lightweight alternative to the PNG attachments of plot_change_history.
+    """
+    first_date, last_date, rows = summarize_repository(repo_data)
+    table_rows = []
+    for row in rows:
+        table_rows.append(f'<tr><td><span style="color:{row["color"]}">&#9632;</span> {html.escape(row["author"])}</td>'
+                          f'<td align="right">{row["commits"]}</td><td align="right">{row["insertions"]}</td>'
+                          f'<td align="right">{row["deletions"]}</td><td align="right">{row["line_changes"]}</td>'
+                          f'<td>{html.escape(row["file_types"])}</td>'
+                          f'<td style="font-family:monospace;color:{row["color"]}">{row["sparkline"]}</td></tr>')
+    return (f'<h3>Repository {html.escape(repo_data["name"])}</h3>'
+            + '<table border="1" cellspacing="0" cellpadding="3" style="border-collapse:collapse">'
+            + '<tr><th>Author</th><th>Commits</th><th>Insertions</th><th>Deletions</th>'
+            + f'<th>Line Changes</th><th>By File Type</th><th>Daily Changes {first_date} to {last_date}</th></tr>'
+            + "".join(table_rows) + "</table>\n")
+
+
+def format_text_report(repo_data):
+    """
+    Format the same per-author summary as format_html_report as plain text.
+    """
+    first_date, last_date, rows = summarize_repository(repo_data)
+    lines = [f"Repository {repo_data['name']} (daily changes {first_date} to {last_date})"]
+    for row in rows:
+        file_types = f" ({row['file_types']})" if row["file_types"] else ""
+        lines.append(f"  {row['sparkline']}  {row['author']}: {row['commits']} commits, "
+                     f"+{row['insertions']} -{row['deletions']} lines{file_types}")
+    return "\n".join(lines) + "\n\n"
+
+
+def track_git_changes(repo_dict_data, overleaf_auth_dict, folder="./git_repos/", backfill=None, workers=None,
+                      streaming=False):
+    """
+    Clone or pull each repository and compute its statistics.
+
+    backfill selects the parallel history backfill (see backfill_statistics); by default it is used
+    for repositories that are cloned for the first time. streaming selects the bounded-memory
+    aggregation (see stream_statistics) and takes precedence over backfill.
+    """
     # repo_url = "https://git.overleaf.com/your-repository-id"  # Replace with your Overleaf Git repository URL
     username = overleaf_auth_dict["username"]  # Replace with your Overleaf username or email
     token = overleaf_auth_dict["token"]  # Replace with your personal access token
@@ -219,15 +616,28 @@ def track_git_changes(repo_dict_data, overleaf_auth_dict, folder="./git_repos/")
     for repo_dict in repo_dict_data:
         # repo_type = repo_dict["type"]
         # repo_notify = repo_dict["notify"]
+        if repo_dict["type"] == GOOGLE_DOC_TYPE:
+            continue  # Google Docs are not git repositories
         repo_auth = repo_dict["auth"]
         repo_name = repo_dict["name"]
         repo_url = repo_dict["url"]
         local_path = folder + repo_name  # Specify a directory to clone the repository
+        first_run = not os.path.exists(local_path)
         repo = clone_or_pull_repo(repo_url, repo_auth, local_path, username, token)
         if not repo:
             return
+        if repo.git.version_info[:2] < MIN_GIT_VERSION:
+            print(f"Error: git {'.'.join(map(str, MIN_GIT_VERSION))} or newer is required to compute statistics, "
+                  + f"found git {'.'.join(map(str, repo.git.version_info))}")
+            return
         # Compute statistics for the past week
-        repo_dict["stats"] = gather_statistics(repo)
+        exclude = (DEFAULT_OVERLEAF_EXCLUDE if repo_auth == "Overleaf" else []) + repo_dict.get("exclude", [])
+        if streaming:
+            repo_dict["stats"] = stream_statistics(repo, repo_dict.get("include"), exclude)
+        elif backfill or (backfill is None and first_run):
+            repo_dict["stats"] = backfill_statistics(repo, repo_dict.get("include"), exclude, workers)
+        else:
+            repo_dict["stats"] = gather_statistics(repo, repo_dict.get("include"), exclude)
     return statistics
 
 
@@ -1,11 +1,17 @@
 import argparse
 from datetime import datetime
-from cwcid_git_commit_analysis import track_git_changes, plot_change_history, send_email
+from cwcid_git_commit_analysis import track_git_changes, plot_change_history, send_email, format_html_report, \
+    format_text_report, write_statistics
+from cwcid_author_index import build_author_index, summarize_author, format_author_summary, GOOGLE_DOC_TYPE
 import os
+import sys
 
 if __name__ == "__main__":
     from cwcid_default_auth_credentials import email_auth_dict, overleaf_auth_dict
+    import cwcid_default_repository_data
     from cwcid_default_repository_data import repo_dict_data
+    # Author aliases are optional in the repository data file
+    author_alias_dict = getattr(cwcid_default_repository_data, "author_alias_dict", {})
 
     # Create an ArgumentParser object
     parser = argparse.ArgumentParser(description='A script to monitor git repository changes and notify contributors.')
@@ -13,6 +19,14 @@ if __name__ == "__main__":
     # Add arguments
     parser.add_argument('-n', '--notify', action='store_true',
                         help='Send report notifications to contributors via email')
+    parser.add_argument('-b', '--backfill', action=argparse.BooleanOptionalAction, default=None,
+                        help='Compute statistics over the full history in parallel (default: only for new clones)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of worker processes used for the history backfill (default: all cores)')
+    parser.add_argument('-s', '--streaming', action='store_true',
+                        help='Aggregate statistics per day in bounded memory instead of keeping every commit')
+    parser.add_argument('-r', '--report-format', choices=['png', 'html'], default='png',
+                        help='Send reports as PNG plot attachments or as an HTML body with inline sparklines')
     # Parse the arguments
     args = parser.parse_args()
 
@@ -21,34 +35,55 @@ if __name__ == "__main__":
     # Get the current date
     now = datetime.now()
 
-    track_git_changes(repo_dict_data, overleaf_auth_dict)
+    track_git_changes(repo_dict_data, overleaf_auth_dict, backfill=args.backfill, workers=args.workers,
+                      streaming=args.streaming)
+
+    google_doc_dicts = [repo_dict for repo_dict in repo_dict_data if repo_dict["type"] == GOOGLE_DOC_TYPE]
+    if google_doc_dicts:
+        # Imported only when needed since the module authenticates with Google on import
+        from cwcid_google_doc_analysis import get_revision_history_v2, compute_word_contributions
+        for doc_dict in google_doc_dicts:
+            revisions = get_revision_history_v2(doc_dict["document_id"])
+            doc_dict["stats"] = compute_word_contributions(doc_dict["document_id"], revisions)
+
+    if args.streaming and not notify:
+        # Stream the per-day text report of each repository instead of building it in memory
+        for repo_dict in repo_dict_data:
+            if "stats" in repo_dict and repo_dict["type"] != GOOGLE_DOC_TYPE:
+                print(f"** STATISTICS FOR REPOSITORY {repo_dict['name']} **")
+                write_statistics(repo_dict["stats"], sys.stdout)
 
     # collect statistics on each repository
+    html_reports = {}
+    text_reports = {}
     for repo_dict in repo_dict_data:
         # print(repo_dict)
-        if "stats" in repo_dict:
+        if "stats" in repo_dict and repo_dict["type"] != GOOGLE_DOC_TYPE:
             repo_stats = repo_dict["stats"]
-            plot_change_history(repo_dict)
+            if args.report_format == "html":
+                # Render each repository once and share the section between recipients
+                html_reports[repo_dict["name"]] = format_html_report(repo_dict)
+                text_reports[repo_dict["name"]] = format_text_report(repo_dict)
+            else:
+                plot_change_history(repo_dict)
 
     # print(repo_dict_data)
+    # Build the author/identity index once and route notifications from it
+    author_index = build_author_index(repo_dict_data, author_alias_dict)
     author_notifications = {}
     email_body = "Report statistics are included in attachment plots."
-    for repo_dict in repo_dict_data:
-        repo_notify = repo_dict["notify"]
-        for notify_email in repo_notify["TO"]:
-            if notify_email not in author_notifications:
-                author_notifications[notify_email] = {"body": "", "CC": [], "Reply-to": [], "attachments": []}
-            # email_body = format_statistics(repo_dict["stats"])
-            # updated_body = author_notifications[notify_email]["body"] + email_body
-            updated_body = email_body
-            updated_CC = list(set(author_notifications[notify_email]["CC"] + repo_notify["CC"]))
-            updated_ReplyTo = list(set(author_notifications[notify_email]["Reply-to"] + repo_notify["Reply-to"]))
-            updated_attachments = list(set(author_notifications[notify_email]["attachments"]
-                                           + repo_dict["activity_plot"]))
-            author_notifications[notify_email] = {"body": f"{updated_body}", "CC": updated_CC,
-                                                  "Reply-to": updated_ReplyTo, "attachments": updated_attachments}
-            print(f"Repo {repo_dict['name']}: Preparing email to {notify_email}"
-                  + f" and CC: {author_notifications[notify_email]['CC']}")
+    html_body = None
+    for notify_email, recipient in author_index["recipients"].items():
+        if args.report_format == "html":
+            email_body = "".join(text_reports.get(repo_name, "") for repo_name in recipient["repos"])
+            html_body = "<html><body>" + "".join(html_reports.get(repo_name, "")
+                                                 for repo_name in recipient["repos"]) + "</body></html>"
+        author_notifications[notify_email] = {"body": email_body, "html_body": html_body,
+                                              "CC": list(recipient["CC"]),
+                                              "Reply-to": list(recipient["Reply-to"]),
+                                              "attachments": list(recipient["attachments"])}
+        print(f"Repos {list(recipient['repos'])}: Preparing email to {notify_email}"
+              + f" and CC: {author_notifications[notify_email]['CC']}")
 
     for notify_email in author_notifications.keys():
         # Send the statistics via email
@@ -62,9 +97,13 @@ if __name__ == "__main__":
             email_routing_dict = {"TO": [notify_email], "CC": CC_list, "Reply-to": reply_to_list}
             now_datestr = now.strftime("%Y-%m-%d")
             email_subject = f"Daily Code and Writing Productivity Report for {now_datestr}"
-            send_email(email_subject, email_body, email_routing_dict, email_auth_dict, attachments)
+            send_email(email_subject, email_body, email_routing_dict, email_auth_dict, attachments,
+                       html_body=author_notifications[notify_email]["html_body"])
         else:
             print(f"** REPORT FOR AUTHOR {notify_email} **:\n {email_body}")
+            author_summary = summarize_author(author_index, notify_email)
+            if author_summary:
+                print(format_author_summary(author_summary))
 
     # Remove temporary image files created for email attachments
     for repo_dict in repo_dict_data: